@@ -1,10 +1,10 @@
 import streamlit as st
 import pandas as pd
 from utils.search_engine import load_dataset, search_publications
-from utils.ai_summarizer import summarize_text
+from utils.ai_summarizer import summarize_text, summarize_online_groq
 from utils.graph_builder import build_graph
 from dotenv import load_dotenv
-import os, requests, io, json
+import os, requests, io, json, hashlib
 from bs4 import BeautifulSoup
 
 # Load .env
@@ -119,6 +119,9 @@ display_mode = st.sidebar.radio("Display Mode", ["Compact", "Detailed"], index=0
 st.sidebar.header("📊 Visualization Options")
 viz_mode = st.sidebar.radio("Graph Type", ["Interactive Network", "Plotly Charts", "Both"], index=2)
 
+# Number of result cards rendered per page
+RESULTS_PAGE_SIZE = 20
+
 # Local cache file for summaries
 CACHE_FILE = "summary_cache.json"
 
@@ -130,12 +133,27 @@ else:
     cache = {}
 
 
-# Load dataset
-@st.cache_data
+def save_cache():
+    # Write to a temp file first so a crash can't leave a truncated cache behind
+    tmp_path = CACHE_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, CACHE_FILE)
+
+
+# Load dataset once per process; it's treated as read-only, so skip the
+# per-rerun hashing and copying that st.cache_data does
+@st.cache_resource
 def load_data():
     return load_dataset("nasa_space_biology_608.csv")
 
 
+# Graph HTML only depends on the query, since df is loaded once
+@st.cache_data(show_spinner=False)
+def load_graph_html(query, _df):
+    return build_graph(_df, query)
+
+
 df = load_data()
 
 # Display stats
@@ -219,8 +237,25 @@ if query:
 
             st.subheader(f"📚 Results for '{query}'")
 
+            # Tabular view of the results, capped so the browser payload stays small
+            with st.expander("📋 Table View"):
+                st.dataframe(
+                    results.head(50),
+                    column_config={"link": st.column_config.LinkColumn("link")},
+                    hide_index=True,
+                    use_container_width=True,
+                )
+
+            # Only render cards for the current page of results
+            num_pages = max(1, -(-len(results) // RESULTS_PAGE_SIZE))
+            page = 1
+            if num_pages > 1:
+                page = st.number_input("Page", min_value=1, max_value=num_pages, value=1, step=1)
+            page_start = (page - 1) * RESULTS_PAGE_SIZE
+            page_results = results.iloc[page_start:page_start + RESULTS_PAGE_SIZE]
+
             # Display results
-            for i, row in enumerate(results.itertuples(), start=1):
+            for i, row in enumerate(page_results.itertuples(), start=page_start + 1):
                 title = row.title
                 link = getattr(row, "link", None)
                 abstract = getattr(row, "abstract", "")[:200] + "..." if hasattr(row, "abstract") else ""
@@ -266,27 +301,43 @@ if query:
                         try:
                             # Check if abstract column exists
                             if 'abstract' in results.columns and not results['abstract'].dropna().empty:
-                                # Use abstracts if available
-                                summary_text = " ".join(results['abstract'].dropna().head(5).tolist())
+                                # Use abstracts if available, summarized together in one call
+                                summary_input = results['abstract'].dropna().head(5).tolist()
+                                summary_text = " ".join(summary_input)
                             elif 'description' in results.columns and not results['description'].dropna().empty:
                                 # Try description column as fallback
-                                summary_text = " ".join(results['description'].dropna().head(5).tolist())
+                                summary_input = results['description'].dropna().head(5).tolist()
+                                summary_text = " ".join(summary_input)
                             else:
                                 # Use titles and any available text
                                 summary_text = f"Research papers about {query}: " + ". ".join(
                                     results['title'].head(10).tolist())
+                                summary_input = summary_text
 
                             # Check if we have enough text
                             if len(summary_text.strip()) < 50:
                                 st.warning(
                                     "Not enough text content available for summarization. Try including abstracts in your dataset.")
                             else:
-                                summary = summarize_text(summary_text, api_key)
+                                # Reuse the summary if this exact text was summarized before
+                                cache_key = hashlib.sha1(summary_text.encode("utf-8")).hexdigest()
+                                if cache_key in cache:
+                                    summary = cache[cache_key]
+                                else:
+                                    summary = summarize_online_groq(summary_input, api_key)
+                                    if summary:
+                                        cache[cache_key] = summary
+                                        save_cache()
+                                    else:
+                                        # Offline fallbacks aren't cached, so the next click retries Groq
+                                        summary = summarize_text(summary_input)
                                 st.success("Summary Generated!")
+                                # Raw HTML collapses newlines, so break the bullet lines explicitly
+                                summary_html = summary.replace("\n", "<br>")
                                 st.markdown(f"""
                                 <div style="background-color: #1E2128; padding: 20px; border-radius: 10px; border-left: 4px solid #6BE6C1;">
                                     <h4 style="color: #6BE6C1; margin-top: 0;">📝 AI Summary</h4>
-                                    <p style="color: #CCC; line-height: 1.6;">{summary}</p>
+                                    <p style="color: #CCC; line-height: 1.6;">{summary_html}</p>
                                 </div>
                                 """, unsafe_allow_html=True)
 
@@ -308,9 +359,7 @@ if query:
                 st.markdown("### 🕸️ Interactive Knowledge Graph")
                 with st.spinner("Building interactive network graph..."):
                     try:
-                        graph_path = build_graph(df, query)
-                        with open(graph_path, "r", encoding="utf-8") as f:
-                            html_code = f.read()
+                        html_code = load_graph_html(query, df)
                         st.components.v1.html(html_code, height=650, scrolling=True)
                     except Exception as e:
                         st.error(f"⚠️ Could not build interactive graph: {e}")
@@ -1,8 +1,13 @@
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from tqdm import tqdm
 from fetch_abstract import fetch_abstract
 
 INPUT_CSV = "sample_data/nasa_space_biology_608_sample.csv"
-OUTPUT_CSV = "sample_data/nasa_space_biology_608_enriched.csv"
+OUTPUT_PATH = "sample_data/nasa_space_biology_608_enriched.parquet"
+
+# Fetching is network-bound, so threads overlap the waiting
+MAX_WORKERS = 32
 
 def enrich_csv():
     df = pd.read_csv(INPUT_CSV)
@@ -10,15 +15,15 @@ def enrich_csv():
     if "Title" not in df.columns or "Link" not in df.columns:
         raise ValueError("CSV must contain 'Title' and 'Link' columns")
 
-    abstracts = []
-    for i, row in df.iterrows():
-        print(f"🔎 Fetching abstract for {i+1}/{len(df)}: {row['Title']}")
-        abstract = fetch_abstract(row["Link"])
-        abstracts.append(abstract)
+    links = df["Link"].tolist()
+    print(f"🔎 Fetching abstracts for {len(links)} papers...")
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # executor.map preserves input order
+        abstracts = list(tqdm(executor.map(fetch_abstract, links), total=len(links)))
 
     df["Abstract"] = abstracts
-    df.to_csv(OUTPUT_CSV, index=False, encoding="utf-8")
-    print(f"✅ Enriched CSV saved as {OUTPUT_CSV}")
+    df.to_parquet(OUTPUT_PATH, index=False, compression="zstd")
+    print(f"✅ Enriched dataset saved as {OUTPUT_PATH}")
 
 if __name__ == "__main__":
     enrich_csv()
@@ -1,25 +1,57 @@
+import functools
+import hashlib
+
+import diskcache
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Shared session so repeated fetches reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.headers.update({
+    "User-Agent": "BioOrbit/1.0 (NASA Space Biology Explorer)",
+    "Accept-Encoding": "gzip, deflate",
+})
+
+# Abstracts don't change, so keep them on disk across runs. Empty results
+# expire quickly so transient failures get retried on the next run.
+_CACHE = diskcache.Cache(".abstract_cache")
+EMPTY_RESULT_TTL = 60 * 60
 
+# Only the tags we look for below get built into the tree
+_ABSTRACT_TAGS = SoupStrainer(["div", "section", "p"])
+
+@functools.lru_cache(maxsize=4096)
 def fetch_abstract(url):
     if not url or not url.startswith("http"):
         return ""
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    abstract = _CACHE.get(key)
+    if abstract is None:
+        abstract = _download_abstract(url)
+        _CACHE.set(key, abstract, expire=None if abstract else EMPTY_RESULT_TTL)
+    return abstract
+
+def _download_abstract(url):
     try:
-        resp = requests.get(url, timeout=10)
+        resp = _SESSION.get(url, timeout=10)
         if resp.status_code != 200:
             return ""
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        # Example: try to find abstract by common tags
-        abstract = ""
-        if soup.find("div", {"class": "abstract"}):
-            abstract = soup.find("div", {"class": "abstract"}).get_text(" ", strip=True)
-        elif soup.find("section", {"id": "abstract"}):
-            abstract = soup.find("section", {"id": "abstract"}).get_text(" ", strip=True)
-        elif soup.find("p"):
-            # fallback: first paragraph
-            abstract = soup.find("p").get_text(" ", strip=True)
+        # lxml sniffs the encoding from the raw bytes itself
+        soup = BeautifulSoup(resp.content, "lxml", parse_only=_ABSTRACT_TAGS)
 
-        return abstract
+        # Try common abstract containers first, then fall back to the first paragraph
+        node = (soup.select_one("div.abstract")
+                or soup.select_one("section#abstract")
+                or soup.select_one("p"))
+        return node.get_text(" ", strip=True) if node else ""
     except Exception as e:
         return ""
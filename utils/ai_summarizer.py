@@ -1,20 +1,31 @@
 import os
+import json
+import functools
+import re
+from itertools import islice
 import requests
 
+GROQ_URL = 'https://api.groq.com/openai/v1/chat/completions'
+GROQ_MODEL = 'llama-3.1-8b-instant'
+
+# Sentences of 30+ characters ending in . ! or ?, used by the last-resort fallback
+_SENT_RE = re.compile(r'[^.!?\s][^.!?]{29,}[.!?]')
+
 def summarize_online_groq(text, api_key):
     """Summarize text using Groq API with simpler approach."""
     if not api_key:
         return None
+    if isinstance(text, (list, tuple)):
+        return summarize_batch_groq(text, api_key)
 
     try:
-        url = 'https://api.groq.com/openai/v1/chat/completions'
         headers = {
             'Authorization': f'Bearer {api_key}',
             'Content-Type': 'application/json'
         }
 
         payload = {
-            'model': 'llama-3.1-8b-instant',
+            'model': GROQ_MODEL,
             'messages': [
                 {
                     'role': 'user',
@@ -25,7 +36,7 @@ def summarize_online_groq(text, api_key):
             'max_tokens': 400
         }
 
-        resp = requests.post(url, json=payload, headers=headers, timeout=30)
+        resp = requests.post(GROQ_URL, json=payload, headers=headers, timeout=30)
         resp.raise_for_status()
         data = resp.json()
 
@@ -42,23 +53,74 @@ def summarize_online_groq(text, api_key):
         return None
 
 
+def summarize_batch_groq(abstracts, api_key):
+    """Summarize several abstracts in a single Groq call, one bullet point per paper."""
+    numbered = "\n\n".join(f"[{i}] {abstract}" for i, abstract in enumerate(abstracts, start=1))
+    prompt = (
+        "Summarize each of these NASA biology paper abstracts in one concise sentence. "
+        'Respond with a JSON object of the form {"summaries": ["...", "..."]}, '
+        "one entry per abstract, in the same order.\n\n" + numbered
+    )
+
+    try:
+        headers = {
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': 'application/json'
+        }
+
+        payload = {
+            'model': GROQ_MODEL,
+            'messages': [{'role': 'user', 'content': prompt}],
+            'response_format': {'type': 'json_object'},
+            'temperature': 0.3,
+            'max_tokens': 150 * len(abstracts)
+        }
+
+        resp = requests.post(GROQ_URL, json=payload, headers=headers, timeout=30)
+        resp.raise_for_status()
+        data = resp.json()
+
+        content = json.loads(data['choices'][0]['message']['content'])
+        summaries = [str(s).strip() for s in content.get('summaries', []) if str(s).strip()]
+        if not summaries:
+            return None
+
+        return "\n".join(f"• {s}" for s in summaries)
+
+    except Exception as e:
+        print(f"⚠️ Groq API error: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def _get_summarizer():
+    """Load the offline summarization pipeline once per process."""
+    from transformers import pipeline
+    return pipeline('summarization', model='t5-small')
+
+
 def summarize_offline(text):
     """Fallback basic summarizer."""
     try:
-        from transformers import pipeline
-        summarizer = pipeline('summarization', model='t5-small')
+        summarizer = _get_summarizer()
         chunk = text[:1000]
         out = summarizer(chunk, max_length=150, min_length=40, do_sample=False)
         return out[0]['summary_text']
     except:
         # Ultra-simple fallback
-        sentences = [s.strip() + '.' for s in text.split('.') if len(s.strip()) > 30]
-        return ' '.join(sentences[:4]) + '...' if sentences else "Summary not available."
+        # Stop scanning after the first 4 matches
+        sentences = [m.group() for m in islice(_SENT_RE.finditer(text), 4)]
+        return ' '.join(sentences) + '...' if sentences else "Summary not available."
 
 
 def summarize(text, api_key=None):
-    """Main summarization function."""
-    if not text or len(text.strip()) < 50:
+    """Main summarization function. `text` may be a string or a list of abstracts."""
+    if isinstance(text, (list, tuple)):
+        text = [t for t in text if t and t.strip()]
+        joined = " ".join(text)
+    else:
+        joined = text
+    if not joined or len(joined.strip()) < 50:
         return "Insufficient text for summarization."
 
     # Try online first
@@ -69,7 +131,7 @@ def summarize(text, api_key=None):
         print("⚠️ Online summarization failed, using fallback...")
 
     # Fallback to offline
-    return summarize_offline(text)
+    return summarize_offline(joined)
 
 
 # Alias for backward compatibility
@@ -8,6 +8,109 @@ import networkx as nx
 from pyvis.network import Network
 import os
 from collections import Counter
+from itertools import combinations
+from utils.search_engine import query_mask
+
+
+# Nodes are laid out server-side, so the browser doesn't need to simulate physics
+_PHYSICS_OPTIONS = """
+{
+    "physics": {
+        "enabled": false
+    },
+    "interaction": {
+        "hover": true,
+        "navigationButtons": true,
+        "keyboard": true
+    },
+    "nodes": {
+        "font": {
+            "size": 12
+        }
+    },
+    "edges": {
+        "smooth": {
+            "type": "continuous"
+        }
+    }
+}
+"""
+
+# Spread of the precomputed layout, in vis.js canvas pixels
+_LAYOUT_SCALE = 400
+
+# Static parts of the knowledge graph page wrapped around the PyVis output
+_PAGE_STYLE = """
+<style>
+    body {
+        margin: 0;
+        padding: 20px;
+        font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
+        background-color: #F8F9FA;
+    }
+    .header {
+        text-align: center;
+        margin-bottom: 20px;
+        padding: 15px;
+        background: white;
+        border-radius: 8px;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+    }
+    .header h2 {
+        margin: 0;
+        color: #333;
+        font-size: 22px;
+    }
+    .legend {
+        display: flex;
+        justify-content: center;
+        gap: 30px;
+        margin-top: 10px;
+        font-size: 14px;
+        color: #666;
+    }
+    .legend-item {
+        display: flex;
+        align-items: center;
+        gap: 8px;
+    }
+    .legend-dot {
+        width: 12px;
+        height: 12px;
+        border-radius: 50%;
+    }
+    #mynetwork {
+        border-radius: 8px;
+        box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+        background: white;
+    }
+</style>
+"""
+
+_LEGEND_HTML = """
+<div class="legend">
+    <div class="legend-item">
+        <div class="legend-dot" style="background-color: #FF6B6B;"></div>
+        <span>Research Papers</span>
+    </div>
+    <div class="legend-item">
+        <div class="legend-dot" style="background-color: #4ECDC4;"></div>
+        <span>Authors</span>
+    </div>
+</div>
+"""
+
+
+def _column_values(df, col, default):
+    """Return a column as a numpy array, or `default` repeated if it's missing."""
+    if col in df.columns:
+        return df[col].to_numpy()
+    return [default] * len(df)
+
+
+def _network_html(net):
+    """Render a PyVis network to an HTML string without touching the disk."""
+    return net.generate_html(notebook=False)
 
 
 def build_graph(df, query, max_nodes=20):
@@ -20,18 +123,14 @@ def build_graph(df, query, max_nodes=20):
         max_nodes: Maximum number of nodes to display (default: 20)
 
     Returns:
-        str: Path to the generated HTML file
+        str: HTML content of the graph page
     """
 
     # Filter relevant papers based on query
     query_lower = query.lower()
 
     # Search in title, abstract, and keywords
-    mask = df['title'].str.lower().str.contains(query_lower, na=False)
-    if 'abstract' in df.columns:
-        mask = mask | df['abstract'].str.lower().str.contains(query_lower, na=False)
-    if 'keywords' in df.columns:
-        mask = mask | df['keywords'].str.lower().str.contains(query_lower, na=False)
+    mask = query_mask(df, query_lower, columns=['title', 'abstract', 'keywords'])
 
     relevant_papers = df[mask].head(max_nodes)
 
@@ -40,20 +139,22 @@ def build_graph(df, query, max_nodes=20):
         net = Network(height="600px", width="100%", bgcolor="#F8F9FA", font_color="#333")
         net.add_node(0, label="No papers found for this query", color="#FF6B6B", size=30)
 
-        output_path = "temp_graph.html"
-        net.save_graph(output_path)
-        return output_path
+        return _network_html(net)
 
     # Create NetworkX graph
     G = nx.Graph()
 
+    # Pull the needed columns out once instead of building a Series per row
+    paper_ids = [f"paper_{idx}" for idx in relevant_papers.index]
+    titles = _column_values(relevant_papers, 'title', 'Unknown')
+    years = _column_values(relevant_papers, 'year', 'N/A')
+    citation_counts = _column_values(relevant_papers, 'citations', 0)
+
     # Add paper nodes
-    for idx, row in relevant_papers.iterrows():
-        paper_id = f"paper_{idx}"
-        title = row.get('title', 'Unknown')[:60]
-        year = row.get('year', 'N/A')
-        citations = row.get('citations', 0)
-        authors = row.get('authors', 'Unknown')
+    for paper_id, full_title, year, citations, authors in zip(
+            paper_ids, titles, years, citation_counts,
+            _column_values(relevant_papers, 'authors', 'Unknown')):
+        title = full_title[:60]
 
         # Node properties
         node_label = f"{title}\n({year})"
@@ -61,35 +162,25 @@ def build_graph(df, query, max_nodes=20):
 
         G.add_node(paper_id,
                    label=node_label,
-                   title=f"<b>{row.get('title', 'Unknown')}</b><br>Year: {year}<br>Citations: {citations}<br>Authors: {authors[:100]}",
+                   title=f"<b>{full_title}</b><br>Year: {year}<br>Citations: {citations}<br>Authors: {authors[:100]}",
                    size=node_size,
                    color='#FF6B6B')
 
     # Extract and add author nodes
     author_papers = {}
 
-    for idx, row in relevant_papers.iterrows():
-        paper_id = f"paper_{idx}"
-        authors = row.get('authors', '')
-
-        if pd.notna(authors) and authors:
-            # Parse authors
-            author_list = []
-            for sep in [',', ';', '|']:
-                if sep in str(authors):
-                    author_list = [a.strip() for a in str(authors).split(sep)]
-                    break
-            if not author_list:
-                author_list = [str(authors).strip()]
-
-            # Take first 3 authors to avoid clutter
-            for author in author_list[:3]:
-                if author:
-                    author_clean = author[:30]  # Truncate long names
-
-                    if author_clean not in author_papers:
-                        author_papers[author_clean] = []
-                    author_papers[author_clean].append(paper_id)
+    # Split every author string in one vectorized pass; only the first 3 are used
+    if 'authors' in relevant_papers.columns:
+        author_lists = (relevant_papers['authors'].fillna('').astype(str)
+                        .str.split(r'[,;|]', n=3, regex=True))
+    else:
+        author_lists = [[] for _ in paper_ids]
+
+    for paper_id, author_list in zip(paper_ids, author_lists):
+        # Take first 3 authors to avoid clutter, truncating long names
+        for author_clean in [a.strip()[:30] for a in author_list[:3]]:
+            if author_clean:
+                author_papers.setdefault(author_clean, []).append(paper_id)
 
     # Add author nodes and edges
     for author, papers in author_papers.items():
@@ -109,17 +200,20 @@ def build_graph(df, query, max_nodes=20):
             for paper in papers:
                 G.add_edge(author_id, paper, color='#CCCCCC')
 
-    # Add co-authorship edges between papers
-    paper_nodes = [n for n in G.nodes() if n.startswith('paper_')]
-    for i, paper1 in enumerate(paper_nodes):
-        for paper2 in paper_nodes[i + 1:]:
-            # Check if papers share authors
-            authors1 = set([a for a, papers in author_papers.items() if paper1 in papers])
-            authors2 = set([a for a, papers in author_papers.items() if paper2 in papers])
+    # Add co-authorship edges between papers that share an author
+    shared_author_counts = Counter()
+    for papers in author_papers.values():
+        for paper1, paper2 in combinations(dict.fromkeys(papers), 2):
+            shared_author_counts[(paper1, paper2)] += 1
+
+    for paper1, paper2 in shared_author_counts:
+        G.add_edge(paper1, paper2, color='#E8E8E8', width=0.5)
 
-            shared_authors = authors1.intersection(authors2)
-            if shared_authors:
-                G.add_edge(paper1, paper2, color='#E8E8E8', width=0.5)
+    # Lay out nodes once here instead of running vis.js physics in the browser
+    pos = nx.spring_layout(G, iterations=50, seed=0, scale=_LAYOUT_SCALE)
+    for node, (x, y) in pos.items():
+        G.nodes[node]['x'] = float(x)
+        G.nodes[node]['y'] = float(y)
 
     # Create PyVis network
     net = Network(height="600px",
@@ -129,52 +223,14 @@ def build_graph(df, query, max_nodes=20):
                   notebook=False)
 
     # Configure physics
-    net.set_options("""
-    {
-        "physics": {
-            "enabled": true,
-            "barnesHut": {
-                "gravitationalConstant": -8000,
-                "centralGravity": 0.3,
-                "springLength": 150,
-                "springConstant": 0.04,
-                "damping": 0.09,
-                "avoidOverlap": 0.1
-            },
-            "minVelocity": 0.75,
-            "stabilization": {
-                "enabled": true,
-                "iterations": 200
-            }
-        },
-        "interaction": {
-            "hover": true,
-            "navigationButtons": true,
-            "keyboard": true
-        },
-        "nodes": {
-            "font": {
-                "size": 12
-            }
-        },
-        "edges": {
-            "smooth": {
-                "type": "continuous"
-            }
-        }
-    }
-    """)
+    net.set_options(_PHYSICS_OPTIONS)
 
     # Convert NetworkX graph to PyVis
     net.from_nx(G)
 
-    # Save graph
-    output_path = "temp_graph.html"
-    net.save_graph(output_path)
-
-    # Add custom styling to the HTML
-    with open(output_path, 'r', encoding='utf-8') as f:
-        html_content = f.read()
+    # Render graph, then add custom styling around its body
+    html_content = _network_html(net)
+    body_html = html_content.split('<body>')[1].split('</body>')[0]
 
     # Add title and styling
     custom_html = f"""
@@ -183,74 +239,19 @@ def build_graph(df, query, max_nodes=20):
     <head>
         <meta charset="utf-8">
         <title>Knowledge Graph: {query}</title>
-        <style>
-            body {{
-                margin: 0;
-                padding: 20px;
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
-                background-color: #F8F9FA;
-            }}
-            .header {{
-                text-align: center;
-                margin-bottom: 20px;
-                padding: 15px;
-                background: white;
-                border-radius: 8px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-            .header h2 {{
-                margin: 0;
-                color: #333;
-                font-size: 22px;
-            }}
-            .legend {{
-                display: flex;
-                justify-content: center;
-                gap: 30px;
-                margin-top: 10px;
-                font-size: 14px;
-                color: #666;
-            }}
-            .legend-item {{
-                display: flex;
-                align-items: center;
-                gap: 8px;
-            }}
-            .legend-dot {{
-                width: 12px;
-                height: 12px;
-                border-radius: 50%;
-            }}
-            #mynetwork {{
-                border-radius: 8px;
-                box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-                background: white;
-            }}
-        </style>
+        {_PAGE_STYLE}
     </head>
     <body>
         <div class="header">
             <h2>📊 Knowledge Graph: {query.title()}</h2>
-            <div class="legend">
-                <div class="legend-item">
-                    <div class="legend-dot" style="background-color: #FF6B6B;"></div>
-                    <span>Research Papers</span>
-                </div>
-                <div class="legend-item">
-                    <div class="legend-dot" style="background-color: #4ECDC4;"></div>
-                    <span>Authors</span>
-                </div>
-            </div>
+            {_LEGEND_HTML}
         </div>
-        {html_content.split('<body>')[1]}
+        {body_html}
     </body>
     </html>
     """
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(custom_html)
-
-    return output_path
+    return custom_html
 
 
 def build_simple_graph(df, query):
@@ -260,9 +261,7 @@ def build_simple_graph(df, query):
     query_lower = query.lower()
 
     # Filter papers
-    mask = df['title'].str.lower().str.contains(query_lower, na=False)
-    if 'abstract' in df.columns:
-        mask = mask | df['abstract'].str.lower().str.contains(query_lower, na=False)
+    mask = query_mask(df, query_lower, columns=['title', 'abstract'])
 
     relevant_papers = df[mask].head(15)
 
@@ -304,7 +303,4 @@ def build_simple_graph(df, query):
                              relevant_papers.index[j],
                              color='#DDDDDD')
 
-    output_path = "temp_graph.html"
-    net.save_graph(output_path)
-
-    return output_path
\ No newline at end of file
+    return _network_html(net)
@@ -1,10 +1,75 @@
+import functools
+import itertools
+
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
+
+# Text columns that get a precomputed lowercase mirror for fast substring search
+SEARCH_COLUMNS = ['title', 'abstract', 'keywords']
+
+# Columns the app actually reads; anything else in the CSV is skipped at parse time
+DATASET_COLUMNS = ['title', 'link', 'abstract', 'description', 'year', 'authors', 'keywords', 'citations']
+
+# The most recently loaded dataset, keyed by df.attrs['version'], so query masks
+# for it can be memoized across Streamlit reruns
+_dataset_versions = itertools.count()
+_DATASETS = {}
 
 def load_dataset(path="nasa_space_biology_608.csv"):
-    df = pd.read_csv(path)
+    if path.endswith(".parquet"):
+        usecols = [col for col in pq.read_schema(path).names if col.strip() in DATASET_COLUMNS]
+        df = pd.read_parquet(path, columns=usecols, dtype_backend="pyarrow")
+    else:
+        header = pd.read_csv(path, nrows=0).columns
+        usecols = [col for col in header if col.strip() in DATASET_COLUMNS]
+        df = pd.read_csv(path, engine="pyarrow", usecols=usecols, dtype_backend="pyarrow")
     df.columns = df.columns.str.strip()
+    for col in SEARCH_COLUMNS:
+        if col in df.columns:
+            df[f'_{col}_lc'] = df[col].str.lower()
+
+    version = next(_dataset_versions)
+    df.attrs['version'] = version
+    _DATASETS.clear()
+    _DATASETS[version] = df
     return df
 
+def _is_loaded_dataset(df):
+    version = df.attrs.get('version')
+    return version is not None and _DATASETS.get(version) is df
+
+def lowercase_column(df, col):
+    """Return the lowercase mirror of `col`, computing it if load_dataset didn't."""
+    mirror = f'_{col}_lc'
+    if mirror in df.columns:
+        return df[mirror]
+    return df[col].str.lower()
+
+def _compute_query_mask(df, query_lower, columns):
+    mask = np.zeros(len(df), dtype=bool)
+    for col in columns:
+        col_mask = lowercase_column(df, col).str.contains(query_lower, regex=False, na=False)
+        mask |= col_mask.to_numpy(dtype=bool)
+    mask.setflags(write=False)
+    return mask
+
+@functools.lru_cache(maxsize=128)
+def _cached_query_mask(query_lower, columns, version):
+    return _compute_query_mask(_DATASETS[version], query_lower, columns)
+
+def query_mask(df, query, columns=SEARCH_COLUMNS):
+    """
+    Return a read-only boolean numpy mask of rows where any of `columns` contains
+    `query` (case-insensitive). Masks for the dataset returned by load_dataset are
+    memoized, so repeated reruns with the same query skip the scan entirely.
+    """
+    query_lower = query.lower()
+    columns = tuple(col for col in columns if col in df.columns)
+    if _is_loaded_dataset(df):
+        return _cached_query_mask(query_lower, columns, df.attrs['version'])
+    return _compute_query_mask(df, query_lower, columns)
+
 def search_publications(query, df):
-    results = df[df['title'].str.contains(query, case=False, na=False)]
-    return results[['title', 'link']].head(10)
+    results = df[query_mask(df, query, columns=['title'])]
+    return results[['title', 'link']]
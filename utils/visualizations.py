@@ -3,13 +3,110 @@ Visualization utilities for NASA Space Biology Explorer
 Save this as: utils/visualizations.py
 """
 
+import functools
+import hashlib
+import importlib.util
+import re
+import threading
 import plotly.graph_objects as go
+import plotly.io as pio
 import pandas as pd
 import numpy as np
 import networkx as nx
-from collections import Counter
+from collections import Counter, OrderedDict
 
+# Optional faster layout backend; networkx is the fallback
+try:
+    import igraph as ig
+except ImportError:
+    ig = None
 
+# orjson serializes figures (and their numpy arrays) much faster than the stdlib encoder
+if importlib.util.find_spec('orjson') is not None:
+    pio.json.config.default_engine = 'orjson'
+
+# Separators used between names in the authors column
+AUTHOR_SEPARATORS = r'[,;|]'
+
+# A non-blank name between , or ; separators, for counting authors per paper
+_AUTHOR_NAME_PATTERN = r'[^,;]*[^,;\s][^,;]*'
+
+# Above this many distinct authors, authors on a single paper are left out of the network.
+# The network shows at most 15 papers x 5 authors, so this must stay well below 75
+MAX_UNPRUNED_AUTHORS = 40
+
+# Figures keyed by (generator, query, results hash), least recently used first
+FIGURE_CACHE_SIZE = 64
+_figure_cache = OrderedDict()
+_figure_cache_lock = threading.Lock()
+
+
+def _results_key(results):
+    """Content hash of a results DataFrame, including its index."""
+    hashes = pd.util.hash_pandas_object(results, index=True).to_numpy()
+    return hashlib.md5(hashes.tobytes()).hexdigest()
+
+
+def _cached_figure(build):
+    """
+    Memoize a figure generator on (query, results contents). A hit returns the
+    cached Figure itself, so callers must treat it as read-only.
+    """
+    @functools.wraps(build)
+    def wrapper(df, query, results):
+        key = (build.__name__, query, _results_key(results))
+        with _figure_cache_lock:
+            fig = _figure_cache.get(key)
+            if fig is not None:
+                _figure_cache.move_to_end(key)
+
+        if fig is None:
+            fig = build(df, query, results)
+            with _figure_cache_lock:
+                _figure_cache[key] = fig
+                if len(_figure_cache) > FIGURE_CACHE_SIZE:
+                    _figure_cache.popitem(last=False)
+
+        return fig
+
+    return wrapper
+
+
+def _column(frame, col, default):
+    """Return `col` with missing values filled by `default`, or `default` everywhere if absent."""
+    if col in frame.columns:
+        return frame[col].fillna(default)
+    return pd.Series(default, index=frame.index)
+
+
+def _igraph_layout(n_nodes, edges, seed=42, iterations=50):
+    """Fruchterman-Reingold layout computed by igraph's C implementation."""
+    g = ig.Graph(n=n_nodes, edges=edges)
+    start = np.random.default_rng(seed).uniform(-1, 1, size=(n_nodes, 2)).tolist()
+    return np.asarray(g.layout_fruchterman_reingold(niter=iterations, seed=start).coords)
+
+
+def _network_layout(G, seed=42):
+    """
+    Compute node positions for G, using igraph when available and falling back
+    to networkx's spring layout otherwise.
+    """
+    nodes = list(G.nodes())
+    if len(nodes) < 2:
+        return nx.spring_layout(G, seed=seed)
+
+    node_idx = {node: i for i, node in enumerate(nodes)}
+    edges = [(node_idx[u], node_idx[v]) for u, v in G.edges()]
+
+    if ig is not None:
+        coords = _igraph_layout(len(nodes), edges, seed=seed)
+    else:
+        return nx.spring_layout(G, k=1.5, iterations=50, seed=seed)
+
+    return dict(zip(nodes, coords))
+
+
+@_cached_figure
 def generate_topic_network(df, query, results):
     """
     Generate an interactive author-paper network visualization
@@ -27,30 +124,29 @@ def generate_topic_network(df, query, results):
     authors_list = []
     papers_data = []
 
-    for idx, row in results.head(15).iterrows():  # Limit to top 15 papers
-        title = row.get('title', 'Unknown')
-        authors = row.get('authors', '')
-        citations = row.get('citations', 0)
-        year = row.get('year', 2020)
-
-        # Parse authors (assuming comma-separated or semicolon-separated)
-        if pd.notna(authors) and authors:
-            # Split by common separators
-            author_names = []
-            for sep in [',', ';', '|']:
-                if sep in str(authors):
-                    author_names = [a.strip() for a in str(authors).split(sep)]
-                    break
-            if not author_names:
-                author_names = [str(authors).strip()]
+    head = results.head(15)  # Limit to top 15 papers
+
+    # Split every author string on the common separators in one vectorized pass
+    authors_str = _column(head, 'authors', '').astype(str)
+    author_splits = authors_str.str.split(AUTHOR_SEPARATORS, regex=True)
+
+    # Fill and convert whole columns once instead of checking each cell
+    titles = _column(head, 'title', 'Unknown').tolist()
+    citations_col = _column(head, 'citations', 0).astype(int).tolist()
+    years = _column(head, 'year', 2020).astype(int).tolist()
+
+    for title, authors, author_split, citations, year in zip(
+            titles, authors_str.tolist(), author_splits, citations_col, years):
+        if authors:
+            author_names = [a.strip() for a in author_split]
 
             authors_list.extend(author_names)
 
             papers_data.append({
                 'title': title,
                 'authors': author_names[:5],  # Max 5 authors per paper
-                'citations': int(citations) if pd.notna(citations) else 0,
-                'year': int(year) if pd.notna(year) else 2020
+                'citations': citations,
+                'year': year
             })
 
     if not papers_data:
@@ -64,6 +160,18 @@ def generate_topic_network(df, query, results):
         )
         return fig
 
+    # Truncate long names and drop empty ones
+    for paper in papers_data:
+        paper['authors'] = list(dict.fromkeys(a[:30] for a in paper['authors'] if a))
+
+    # On author-heavy result sets, drop authors who appear on a single paper: they add
+    # nodes without shaping the layout. Each paper keeps its first author so it stays connected.
+    author_counts = Counter(a for paper in papers_data for a in paper['authors'])
+    if len(author_counts) > MAX_UNPRUNED_AUTHORS:
+        for paper in papers_data:
+            shared = [a for a in paper['authors'] if author_counts[a] >= 2]
+            paper['authors'] = shared or paper['authors'][:1]
+
     # Create network graph
     G = nx.Graph()
 
@@ -79,14 +187,12 @@ def generate_topic_network(df, query, results):
 
         # Connect authors to papers
         for author in paper['authors']:
-            if author:  # Skip empty authors
-                author_clean = author[:30]  # Truncate long names
-                G.add_node(author_clean, type='author', label=author_clean)
-                G.add_edge(author_clean, paper_node)
+            G.add_node(author, type='author', label=author)
+            G.add_edge(author, paper_node)
 
     # Generate layout
     try:
-        pos = nx.spring_layout(G, k=1.5, iterations=50, seed=42)
+        pos = _network_layout(G, seed=42)
     except:
         pos = nx.random_layout(G, seed=42)
 
@@ -94,16 +200,21 @@ def generate_topic_network(df, query, results):
     paper_nodes = [n for n, d in G.nodes(data=True) if d.get('type') == 'paper']
     author_nodes = [n for n, d in G.nodes(data=True) if d.get('type') == 'author']
 
-    # Create edge trace
-    edge_x = []
-    edge_y = []
-    for edge in G.edges():
-        x0, y0 = pos[edge[0]]
-        x1, y1 = pos[edge[1]]
-        edge_x.extend([x0, x1, None])
-        edge_y.extend([y0, y1, None])
-
-    edge_trace = go.Scatter(
+    # Positions as an (n, 2) array, with a row lookup for each node
+    nodes_list = list(G.nodes())
+    node_to_row = {node: i for i, node in enumerate(nodes_list)}
+    pos_matrix = np.array([pos[node] for node in nodes_list], dtype=np.float64).reshape(-1, 2)
+
+    # Create edge trace: x0, x1, NaN per edge, where NaN breaks the line between segments
+    n_edges = G.number_of_edges()
+    edge_u = np.fromiter((node_to_row[u] for u, v in G.edges()), dtype=np.int32, count=n_edges)
+    edge_v = np.fromiter((node_to_row[v] for u, v in G.edges()), dtype=np.int32, count=n_edges)
+    edge_x = np.full(3 * n_edges, np.nan)
+    edge_y = np.full(3 * n_edges, np.nan)
+    edge_x[0::3], edge_x[1::3] = pos_matrix[edge_u, 0], pos_matrix[edge_v, 0]
+    edge_y[0::3], edge_y[1::3] = pos_matrix[edge_u, 1], pos_matrix[edge_v, 1]
+
+    edge_trace = go.Scattergl(
         x=edge_x, y=edge_y,
         line=dict(width=0.8, color='#DDD'),
         hoverinfo='none',
@@ -111,15 +222,24 @@ def generate_topic_network(df, query, results):
         showlegend=False)
 
     # Create author nodes trace
-    author_x = [pos[node][0] for node in author_nodes]
-    author_y = [pos[node][1] for node in author_nodes]
+    author_rows = np.fromiter((node_to_row[node] for node in author_nodes), dtype=np.int32,
+                              count=len(author_nodes))
+    author_x, author_y = pos_matrix[author_rows, 0], pos_matrix[author_rows, 1]
     author_text = [G.nodes[node]['label'] for node in author_nodes]
 
-    # Count collaborations per author
-    author_connections = [G.degree(node) for node in author_nodes]
-    author_sizes = [10 + conn * 3 for conn in author_connections]
+    # Count collaborations per author with a single degree lookup
+    degrees = dict(G.degree(author_nodes))
+    author_connections = np.fromiter((degrees[node] for node in author_nodes), dtype=np.int32,
+                                     count=len(author_nodes))
+    author_sizes = 10 + author_connections * 3
 
-    author_trace = go.Scatter(
+    # Build hover strings with numpy string ops rather than per-node formatting
+    author_hovertext = np.char.add(
+        np.char.add('<b>Author:</b> ', np.array(author_text, dtype=str)),
+        np.char.add('<br><b>Collaborations:</b> ', author_connections.astype(str))
+    )
+
+    author_trace = go.Scattergl(
         x=author_x, y=author_y,
         mode='markers+text',
         marker=dict(
@@ -132,24 +252,25 @@ def generate_topic_network(df, query, results):
         textposition="top center",
         textfont=dict(size=9, color='#333'),
         hoverinfo='text',
-        hovertext=[f"<b>Author:</b> {name}<br><b>Collaborations:</b> {conn}"
-                   for name, conn in zip(author_text, author_connections)],
+        hovertext=author_hovertext,
         name='Authors'
     )
 
     # Create paper nodes trace
-    paper_x = [pos[node][0] for node in paper_nodes]
-    paper_y = [pos[node][1] for node in paper_nodes]
+    paper_rows = np.fromiter((node_to_row[node] for node in paper_nodes), dtype=np.int32,
+                             count=len(paper_nodes))
+    paper_x, paper_y = pos_matrix[paper_rows, 0], pos_matrix[paper_rows, 1]
     paper_labels = [G.nodes[node]['label'] for node in paper_nodes]
     paper_titles = [G.nodes[node]['full_title'] for node in paper_nodes]
     paper_citations = [G.nodes[node].get('citations', 0) for node in paper_nodes]
     paper_years = [G.nodes[node].get('year', 'N/A') for node in paper_nodes]
 
     # Normalize citation sizes
-    max_citations = max(paper_citations) if max(paper_citations) > 0 else 1
-    paper_sizes = [25 + (c / max_citations) * 40 for c in paper_citations]
+    citations_arr = np.asarray(paper_citations, dtype=np.float32)
+    max_citations = citations_arr.max() or 1.0
+    paper_sizes = 25.0 + (citations_arr / max_citations) * 40.0
 
-    paper_trace = go.Scatter(
+    paper_trace = go.Scattergl(
         x=paper_x, y=paper_y,
         mode='markers',
         marker=dict(
@@ -194,6 +315,7 @@ def generate_topic_network(df, query, results):
     return fig
 
 
+@_cached_figure
 def generate_citation_impact_scatter(df, query, results):
     """
     Generate a scatter plot showing research focus vs impact
@@ -210,34 +332,35 @@ def generate_citation_impact_scatter(df, query, results):
         return fig
 
     # Extract data
-    papers = []
-    for idx, row in results.head(20).iterrows():
-        title = row.get('title', 'Unknown')
-        citations = row.get('citations', 0)
-        year = row.get('year', 2020)
-        authors = row.get('authors', '')
-        abstract = row.get('abstract', '')
-
-        # Calculate a "research focus" score based on abstract relevance
-        # This uses query term frequency as a proxy for focus
-        focus_score = 1.0
-        if pd.notna(abstract) and abstract:
-            query_terms = query.lower().split()
-            abstract_lower = abstract.lower()
-            matches = sum(abstract_lower.count(term) for term in query_terms)
-            focus_score = min(1 + matches * 0.5, 5)  # Scale 1-5
-        else:
-            focus_score = np.random.uniform(1.5, 4)  # Random if no abstract
-
-        num_authors = 1
-        if pd.notna(authors) and authors:
-            num_authors = len([a for a in str(authors).replace(';', ',').split(',') if a.strip()])
+    head = results.head(20)
+
+    # Count non-blank names per paper in one pass; papers without authors count as 1
+    authors_str = _column(head, 'authors', '').astype(str)
+    num_authors_col = authors_str.str.count(_AUTHOR_NAME_PATTERN).where(authors_str != '', 1)
+
+    # Calculate a "research focus" score based on abstract relevance
+    # This uses query term frequency as a proxy for focus, scaled 1-5
+    abstracts = _column(head, 'abstract', '').astype(str)
+    abstracts_lower = abstracts.str.lower()
+    matches = pd.Series(0, index=head.index)
+    for term in query.lower().split():
+        matches = matches + abstracts_lower.str.count(re.escape(term))
+    focus_col = (1 + matches * 0.5).clip(upper=5).astype(float)
+    # Random if no abstract
+    focus_col = focus_col.mask(abstracts == '', np.random.uniform(1.5, 4, len(head)))
 
+    papers = []
+    for title, citations, year, focus_score, num_authors in zip(
+            _column(head, 'title', 'Unknown').tolist(),
+            _column(head, 'citations', 0).astype(int).tolist(),
+            _column(head, 'year', 2020).astype(int).tolist(),
+            focus_col.tolist(),
+            num_authors_col.astype(int).tolist()):
         papers.append({
             'title': title[:60] + '...' if len(title) > 60 else title,
-            'citations': int(citations) if pd.notna(citations) else 0,
+            'citations': citations,
             'focus': focus_score,
-            'year': int(year) if pd.notna(year) else 2020,
+            'year': year,
             'num_authors': num_authors
         })
 
@@ -255,7 +378,7 @@ def generate_citation_impact_scatter(df, query, results):
     # High impact cluster
     high_impact = df_plot[df_plot['cluster'] == f'High Impact ({query.title()})']
     if not high_impact.empty:
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=high_impact['focus'],
             y=high_impact['citations'],
             mode='markers',
@@ -274,7 +397,7 @@ def generate_citation_impact_scatter(df, query, results):
     # Collaborators/Lower impact
     low_impact = df_plot[df_plot['cluster'] == 'Collaborators/Emerging']
     if not low_impact.empty:
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=low_impact['focus'],
             y=low_impact['citations'],
             mode='markers',
@@ -326,6 +449,7 @@ def generate_citation_impact_scatter(df, query, results):
     return fig
 
 
+@_cached_figure
 def generate_timeline_visualization(df, query, results):
     """
     Generate a timeline showing publications over years
@@ -341,32 +465,35 @@ def generate_timeline_visualization(df, query, results):
         )
         return fig
 
-    # Filter valid years
-    results_with_year = results[results['year'].notna()].copy()
-    results_with_year['year'] = results_with_year['year'].astype(int)
-
-    # Group by year
-    year_counts = results_with_year.groupby('year').size().reset_index(name='count')
-    year_counts = year_counts.sort_values('year')
+    # Count publications per year with bincount over years offset from the earliest
+    years = results['year'].dropna().astype(np.int32).to_numpy()
+    if years.size:
+        year_min = years.min()
+        counts = np.bincount(years - year_min)
+        cumulative = counts.cumsum()
 
-    # Calculate cumulative
-    year_counts['cumulative'] = year_counts['count'].cumsum()
+        # Only plot years that have publications
+        has_pubs = counts > 0
+        year_arr = np.arange(year_min, year_min + counts.size)[has_pubs]
+        counts, cumulative = counts[has_pubs], cumulative[has_pubs]
+    else:
+        year_arr = counts = cumulative = np.array([], dtype=np.int64)
 
     fig = go.Figure()
 
     # Publications per year (bars)
     fig.add_trace(go.Bar(
-        x=year_counts['year'],
-        y=year_counts['count'],
+        x=year_arr,
+        y=counts,
         name='Publications per Year',
         marker=dict(color='#6BE6C1', opacity=0.7),
         hovertemplate='Year: %{x}<br>Publications: %{y}<extra></extra>'
     ))
 
     # Cumulative line
-    fig.add_trace(go.Scatter(
-        x=year_counts['year'],
-        y=year_counts['cumulative'],
+    fig.add_trace(go.Scattergl(
+        x=year_arr,
+        y=cumulative,
         name='Cumulative Publications',
         mode='lines+markers',
         line=dict(color='#FF6B6B', width=3),
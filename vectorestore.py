@@ -1,16 +1,76 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+import faiss
+import numpy as np
 import pandas as pd
 import requests
-from sentence_transformers import SentenceTransformer
+import torch
+from requests.adapters import HTTPAdapter
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
 from langchain.docstore.document import Document
 
 CSV_PATH = "nasa_space_biology_608.csv"
 VECTORSTORE_PATH = "nasa_bioscience_vectorstore"
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Numeric PMC ID in an article link (Arrow-backed str.extract needs a named group)
+PMC_ID_PATTERN = r"PMC(?P<pmc_id>\d+)"
+
+# Local caches so unchanged inputs skip NCBI and re-encoding on rebuilds
+ABSTRACT_CACHE_PATH = ".abstract_cache.sqlite"
+EMBEDDING_CACHE_DIR = ".emb_cache"
 
 # Entrez API base
 ENTREZ_FETCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
+NCBI_API_KEY = os.getenv("NCBI_API_KEY")
+
+# NCBI allows 3 requests/s without an API key and 10 with one
+MAX_REQUESTS_PER_SECOND = 10 if NCBI_API_KEY else 3
+FETCH_WORKERS = 8
+
+class RateLimiter:
+    """Thread-safe limiter spacing calls at least 1/`rate` seconds apart.
+
+    The bucket holds a single token, so no burst can push a one-second
+    window over `rate` calls.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
 
-def fetch_abstract(pmc_id: str) -> str:
+    def wait(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(1.0, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+_rate_limiter = RateLimiter(MAX_REQUESTS_PER_SECOND)
+
+def make_session() -> requests.Session:
+    """Session with a connection pool sized for the fetch workers."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+    return session
+
+def fetch_abstract(session: requests.Session, pmc_id: str) -> str:
     """Fetch abstract text from PubMed Central using NCBI efetch API."""
     try:
         params = {
@@ -19,29 +79,79 @@ def fetch_abstract(pmc_id: str) -> str:
             "retmode": "text",
             "rettype": "abstract"
         }
-        resp = requests.get(ENTREZ_FETCH_URL, params=params, timeout=20)
+        if NCBI_API_KEY:
+            params["api_key"] = NCBI_API_KEY
+        _rate_limiter.wait()
+        resp = session.get(ENTREZ_FETCH_URL, params=params, timeout=20)
         resp.raise_for_status()
         return resp.text.strip()
     except Exception as e:
         print(f"❌ Could not fetch abstract for {pmc_id}: {e}")
         return ""
 
+def load_cached_abstracts() -> dict:
+    """Return previously fetched abstracts keyed by PMC ID."""
+    with closing(sqlite3.connect(ABSTRACT_CACHE_PATH)) as conn, conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS abstracts (pmc_id TEXT PRIMARY KEY, abstract TEXT)")
+        return dict(conn.execute("SELECT pmc_id, abstract FROM abstracts"))
+
+def save_cached_abstracts(abstracts: dict):
+    """Store fetched abstracts keyed by PMC ID."""
+    with closing(sqlite3.connect(ABSTRACT_CACHE_PATH)) as conn, conn:
+        conn.executemany("INSERT OR REPLACE INTO abstracts VALUES (?, ?)", abstracts.items())
+
+def encode_texts(model, texts: list) -> np.ndarray:
+    """Encode texts in one batched call, reusing cached vectors for identical inputs."""
+    digest = hashlib.sha256("\0".join(texts).encode("utf-8")).hexdigest()[:16]
+    cache_path = os.path.join(EMBEDDING_CACHE_DIR, f"{digest}-{EMBEDDING_MODEL}.npy")
+    if os.path.exists(cache_path):
+        print(f"♻️ Reusing cached embeddings from {cache_path}")
+        return np.load(cache_path)
+
+    vectors = model.encode(
+        texts,
+        batch_size=64,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=True
+    )
+    os.makedirs(EMBEDDING_CACHE_DIR, exist_ok=True)
+    np.save(cache_path, vectors)
+    return vectors
+
 def build():
     print(f"📂 Loading data from: {CSV_PATH}")
-    df = pd.read_csv(CSV_PATH)
+    header = pd.read_csv(CSV_PATH, nrows=0).columns
 
     # Use lowercase column names to match your file
-    if "title" not in df.columns or "link" not in df.columns:
+    if "title" not in header or "link" not in header:
         raise ValueError("CSV must contain 'title' and 'link' columns")
 
-    docs = []
-    for _, row in df.iterrows():
-        title = str(row["title"])
-        link = str(row["link"])
+    # Only title and link are needed; pyarrow's reader skips the other columns
+    df = pd.read_csv(CSV_PATH, engine="pyarrow", usecols=["title", "link"], dtype_backend="pyarrow")
+
+    # Extract PMC IDs in one vectorized pass; links without one get ""
+    pmc_ids = df["link"].astype("string").str.extract(PMC_ID_PATTERN, expand=False).fillna("").tolist()
+
+    # Only fetch abstracts we haven't cached from an earlier run
+    cached = load_cached_abstracts()
+    missing = sorted(set(pmc_ids) - {""} - cached.keys())
+    print(f"📚 {len(cached)} abstracts cached, fetching {len(missing)}")
 
-        # Extract PMC ID if available
-        pmc_id = link.split("PMC")[-1].strip("/") if "PMC" in link else None
-        abstract = fetch_abstract(pmc_id) if pmc_id else ""
+    # Fetch abstracts concurrently; the rate limiter keeps us within NCBI's limits
+    session = make_session()
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        fetched = dict(zip(missing, executor.map(lambda pmc_id: fetch_abstract(session, pmc_id), missing)))
+
+    # Failed fetches come back empty; leave them out so the next run retries them
+    save_cached_abstracts({pmc_id: abstract for pmc_id, abstract in fetched.items() if abstract})
+    cached.update(fetched)
+
+    docs = []
+    for title, link, pmc_id in zip(df["title"], df["link"], pmc_ids):
+        title = str(title)
+        link = str(link)
+        abstract = cached[pmc_id] if pmc_id else ""
 
         # Combine title + abstract (fallback: only title)
         content = f"{title}\n\n{abstract}" if abstract else title
@@ -53,11 +163,44 @@ def build():
 
     print(f"🔢 Total docs created: {len(docs)}")
 
-    # Embeddings with sentence-transformers
-    model = SentenceTransformer("all-MiniLM-L6-v2")
-    vectorstore = FAISS.from_documents(
-        docs,
-        embedding=lambda x: model.encode(x, show_progress_bar=True)
+    # Embeddings with sentence-transformers; queries go through the same model,
+    # normalized the same way as the documents below
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    embeddings = HuggingFaceEmbeddings(
+        model_name=EMBEDDING_MODEL,
+        model_kwargs={"device": device},
+        encode_kwargs={"normalize_embeddings": True}
+    )
+    model = embeddings.client
+
+    # FP16 halves memory traffic on GPU; on CPU it's slower, so use every core instead
+    if device == "cuda":
+        model.half()
+    else:
+        torch.set_num_threads(os.cpu_count() or 1)
+
+    # Encode every document in one batched call
+    texts = [doc.page_content for doc in docs]
+    vectors = encode_texts(model, texts)
+
+    # 8-bit scalar-quantized index: a quarter of the FP32 memory. Vectors are
+    # L2-normalized, so inner product ranks the same as cosine similarity
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    index = faiss.IndexScalarQuantizer(
+        vectors.shape[1],
+        faiss.ScalarQuantizer.QT_8bit,
+        faiss.METRIC_INNER_PRODUCT
+    )
+    index.train(vectors)
+    index.add(vectors)
+
+    vectorstore = FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=InMemoryDocstore({str(i): doc for i, doc in enumerate(docs)}),
+        index_to_docstore_id={i: str(i) for i in range(len(docs))},
+        distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
     )
 
     vectorstore.save_local(VECTORSTORE_PATH)